@@ -68,6 +68,7 @@ else
         pillow \
         pydantic \
         pyyaml \
+        orjson \
         structlog \
         aiohttp \
         requests
@@ -3,14 +3,66 @@ Settings Manager - Configuration and User Preferences
 Handles device settings, user preferences, and configuration management.
 """
 
+import atexit
 import logging
+import threading
+import weakref
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 from pydantic import BaseModel, Field
 
+# Legacy YAML configs are only read during migration; prefer libyaml when available
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson
+
+    def _json_dumps(data: Any) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+    _json_loads = orjson.loads
+except ImportError:
+    # Fall back to the standard library when orjson is not installed
+    import json
+
+    def _json_dumps(data: Any) -> bytes:
+        return json.dumps(data, indent=2).encode()
+
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Seconds to wait before retrying a debounced save that failed; doubles per failure up to the max
+FLUSH_RETRY_DELAY = 5.0
+FLUSH_RETRY_MAX_DELAY = 300.0
+
+
+def _flush_at_exit(manager_ref: "weakref.ref[SettingsManager]"):
+    """Write a manager's pending changes at interpreter exit without raising."""
+    manager = manager_ref()
+    if manager is None:
+        return
+    
+    try:
+        manager.flush()
+    except Exception:
+        # Already logged by the write helpers
+        pass
+
+
+def _freeze(value: Any) -> Any:
+    """Return a deeply read-only view of a model_dump() result."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
 
 class DisplayConfig(BaseModel):
     """Display configuration settings."""
@@ -31,6 +83,11 @@ class DisplayConfig(BaseModel):
     spi_rst_pin: int = Field(default=25, description="SPI Reset pin (GPIO)")
     spi_cs_pin: int = Field(default=8, description="SPI Chip Select pin (GPIO)")
     spi_speed: int = Field(default=8000000, description="SPI speed in Hz")
+    
+    @property
+    def i2c_address_int(self) -> int:
+        """I2C address parsed as an integer."""
+        return int(self.i2c_address, 16)
 
 
 class DeviceConfig(BaseModel):
@@ -52,7 +109,7 @@ class UserPreferences(BaseModel):
 class SettingsManager:
     """Manages device configuration and user preferences."""
     
-    def __init__(self, config_dir: Optional[Path] = None):
+    def __init__(self, config_dir: Optional[Path] = None, save_delay: float = 0.25):
         # Set default config directory
         if config_dir is None:
             # Use project root/config directory
@@ -63,19 +120,54 @@ class SettingsManager:
         self.config_dir.mkdir(parents=True, exist_ok=True)
         
         # Configuration file paths
-        self.device_config_path = self.config_dir / "device_config.yaml"
-        self.user_prefs_path = self.config_dir / "user_preferences.yaml"
-        self.default_settings_path = self.config_dir / "default_settings.yaml"
+        self.device_config_path = self.config_dir / "device_config.json"
+        self.user_prefs_path = self.config_dir / "user_preferences.json"
+        self.default_settings_path = self.config_dir / "default_settings.json"
         
         # Load configurations
         self.display_config = DisplayConfig()
         self.device_config = DeviceConfig()
         self.user_preferences = UserPreferences()
         
+        # Cached, deeply read-only model_dump() results per category, invalidated on mutation
+        self._dump_cache: Dict[str, Mapping[str, Any]] = {}
+        
+        # Debounced saves: mutations mark files dirty and a timer writes them
+        self.save_delay = save_delay
+        self._dirty_device = False
+        self._dirty_user = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
+        self._retry_delay = FLUSH_RETRY_DELAY
+        
+        # Serializes snapshot-and-write so an older snapshot never lands after a newer one;
+        # setters only take _flush_lock, so they never wait on disk I/O
+        self._write_lock = threading.Lock()
+        
         self._load_configurations()
+        self._bind_categories()
+        
+        # The flush timer is a daemon thread, so write pending changes on interpreter exit;
+        # the hook holds only a weak reference so it does not keep the manager alive
+        atexit.register(_flush_at_exit, weakref.ref(self))
+    
+    def _bind_categories(self):
+        """Build the category dispatch tables for the current models."""
+        self._categories: Dict[str, BaseModel] = {
+            "display": self.display_config,
+            "device": self.device_config,
+            "user": self.user_preferences
+        }
+        self._savers = {
+            "display": self._save_device_config,
+            "device": self._save_device_config,
+            "user": self._save_user_preferences
+        }
     
     def _load_configurations(self):
         """Load all configuration files."""
+        self._migrate_legacy_yaml()
+        
         try:
             # Load default settings first
             self._load_default_settings()
@@ -93,12 +185,29 @@ class SettingsManager:
             logger.info("Using default configuration")
             self._create_default_configs()
     
+    def _migrate_legacy_yaml(self):
+        """Convert any legacy YAML config files to JSON (one-shot)."""
+        for json_path in (self.default_settings_path, self.device_config_path, self.user_prefs_path):
+            yaml_path = json_path.with_suffix(".yaml")
+            if json_path.exists() or not yaml_path.exists():
+                continue
+            
+            try:
+                data = yaml.load(yaml_path.read_bytes(), Loader=_YamlLoader)
+                
+                with open(json_path, 'wb') as f:
+                    f.write(_json_dumps(data))
+                
+                logger.info(f"Migrated {yaml_path.name} to {json_path.name}")
+                
+            except Exception as e:
+                logger.warning(f"Failed to migrate {yaml_path.name}: {e}")
+    
     def _load_default_settings(self):
         """Load default settings from file."""
         if self.default_settings_path.exists():
             try:
-                with open(self.default_settings_path, 'r') as f:
-                    defaults = yaml.safe_load(f)
+                defaults = _json_loads(self.default_settings_path.read_bytes())
                     
                 if defaults:
                     # Update display config with defaults
@@ -120,8 +229,7 @@ class SettingsManager:
         """Load device-specific configuration."""
         if self.device_config_path.exists():
             try:
-                with open(self.device_config_path, 'r') as f:
-                    config_data = yaml.safe_load(f)
+                config_data = _json_loads(self.device_config_path.read_bytes())
                     
                 if config_data:
                     self.device_config = DeviceConfig(**config_data)
@@ -133,8 +241,7 @@ class SettingsManager:
         """Load user preferences."""
         if self.user_prefs_path.exists():
             try:
-                with open(self.user_prefs_path, 'r') as f:
-                    prefs_data = yaml.safe_load(f)
+                prefs_data = _json_loads(self.user_prefs_path.read_bytes())
                     
                 if prefs_data:
                     self.user_preferences = UserPreferences(**prefs_data)
@@ -145,47 +252,86 @@ class SettingsManager:
     def _create_default_configs(self):
         """Create default configuration files."""
         try:
+            # Dump each model once and reuse it for every file
+            display = self.display_config.model_dump()
+            device = self.device_config.model_dump()
+            user = self.user_preferences.model_dump()
+            
             # Create default settings file
             default_settings = {
-                'display': self.display_config.model_dump(),
-                'device': self.device_config.model_dump(),
-                'user_preferences': self.user_preferences.model_dump()
+                'display': display,
+                'device': device,
+                'user_preferences': user
             }
             
-            with open(self.default_settings_path, 'w') as f:
-                yaml.dump(default_settings, f, default_flow_style=False, indent=2)
+            with open(self.default_settings_path, 'wb') as f:
+                f.write(_json_dumps(default_settings))
             
             # Create device config file
-            with open(self.device_config_path, 'w') as f:
-                yaml.dump(self.device_config.model_dump(), f, default_flow_style=False, indent=2)
+            with open(self.device_config_path, 'wb') as f:
+                f.write(_json_dumps(device))
             
             # Create user preferences file
-            with open(self.user_prefs_path, 'w') as f:
-                yaml.dump(self.user_preferences.model_dump(), f, default_flow_style=False, indent=2)
+            with open(self.user_prefs_path, 'wb') as f:
+                f.write(_json_dumps(user))
+            
+            # Seed the getter caches with the same dumps
+            self._dump_cache = {
+                "display": _freeze(display),
+                "device": _freeze(device),
+                "user": _freeze(user)
+            }
             
             logger.info("Default configuration files created")
             
         except Exception as e:
             logger.error(f"Failed to create default configs: {e}")
     
-    def get_display_config(self) -> Dict[str, Any]:
-        """Get display configuration as dictionary."""
-        return self.display_config.model_dump()
+    def _get_dump(self, category: str) -> Mapping[str, Any]:
+        """Get the cached dump of a settings category, building it if needed."""
+        dump = self._dump_cache.get(category)
+        if dump is None:
+            dump = _freeze(self._categories[category].model_dump())
+            self._dump_cache[category] = dump
+        return dump
+    
+    def get_display_config(self) -> Mapping[str, Any]:
+        """Get display configuration as a deeply read-only mapping."""
+        return self._get_dump("display")
     
-    def get_device_config(self) -> Dict[str, Any]:
-        """Get device configuration as dictionary."""
-        return self.device_config.model_dump()
+    def get_device_config(self) -> Mapping[str, Any]:
+        """Get device configuration as a deeply read-only mapping."""
+        return self._get_dump("device")
     
-    def get_user_preferences(self) -> Dict[str, Any]:
-        """Get user preferences as dictionary."""
-        return self.user_preferences.model_dump()
+    def get_user_preferences(self) -> Mapping[str, Any]:
+        """Get user preferences as a deeply read-only mapping."""
+        return self._get_dump("user")
+    
+    def _apply_updates(self, category: str, updates: Dict[str, Any]):
+        """Validate updates on a copy, then apply them to the live model in place."""
+        model = self._categories[category]
+        validator = type(model).__pydantic_validator__
+        
+        # Validate only the changed fields, so a bad value leaves the model untouched
+        updated = model.model_copy()
+        for key, value in updates.items():
+            validator.validate_assignment(updated, key, value)
+        
+        # Mutate rather than rebind so the dispatch tables keep pointing at this model
+        for key in updates:
+            setattr(model, key, getattr(updated, key))
+        
+        self._dump_cache.pop(category, None)
     
     def update_display_config(self, **kwargs):
-        """Update display configuration settings."""
+        """
+        Update display configuration settings.
+        
+        Changes are validated immediately but written to disk asynchronously;
+        call flush() to persist them now and surface any write error.
+        """
         try:
-            # Update the model with new values
-            updated_data = {**self.display_config.model_dump(), **kwargs}
-            self.display_config = DisplayConfig(**updated_data)
+            self._apply_updates("display", kwargs)
             
             # Save to file
             self._save_device_config()
@@ -196,11 +342,14 @@ class SettingsManager:
             raise
     
     def update_user_preferences(self, **kwargs):
-        """Update user preferences."""
+        """
+        Update user preferences.
+        
+        Changes are validated immediately but written to disk asynchronously;
+        call flush() to persist them now and surface any write error.
+        """
         try:
-            # Update the model with new values
-            updated_data = {**self.user_preferences.model_dump(), **kwargs}
-            self.user_preferences = UserPreferences(**updated_data)
+            self._apply_updates("user", kwargs)
             
             # Save to file
             self._save_user_preferences()
@@ -211,53 +360,131 @@ class SettingsManager:
             raise
     
     def _save_device_config(self):
-        """Save device configuration to file."""
+        """Schedule a debounced save of the device configuration."""
+        with self._flush_lock:
+            self._dirty_device = True
+            self._schedule_flush()
+    
+    def _save_user_preferences(self):
+        """Schedule a debounced save of the user preferences."""
+        with self._flush_lock:
+            self._dirty_user = True
+            self._schedule_flush()
+    
+    def _schedule_flush(self, delay: Optional[float] = None):
+        """Start the flush timer if one is not already pending. Caller holds the lock."""
+        if self._flush_timer is None:
+            if delay is None:
+                delay = self.save_delay
+            self._flush_timer = threading.Timer(delay, self._on_flush_timer)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def _on_flush_timer(self):
+        """Timer callback that writes pending changes, retrying later if a write fails."""
         try:
-            with open(self.device_config_path, 'w') as f:
-                yaml.dump(self.device_config.model_dump(), f, default_flow_style=False, indent=2)
+            self.flush()
+        except Exception:
+            # Already logged by the write helpers; the dirty flags are still set
+            with self._flush_lock:
+                if self._dirty_device or self._dirty_user:
+                    delay = self._retry_delay
+                    self._retry_delay = min(delay * 2, FLUSH_RETRY_MAX_DELAY)
+                    logger.warning(f"Retrying settings save in {delay}s")
+                    self._schedule_flush(delay)
+        else:
+            self._retry_delay = FLUSH_RETRY_DELAY
+    
+    def flush(self):
+        """
+        Write any pending configuration changes to disk.
+        
+        Each file is attempted even if the other fails; files that fail stay
+        dirty and the first error is re-raised.
+        """
+        with self._write_lock:
+            # Snapshot under the lock, then write without holding it
+            with self._flush_lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                
+                device = self.device_config.model_dump() if self._dirty_device else None
+                user = self.user_preferences.model_dump() if self._dirty_user else None
+                self._dirty_device = False
+                self._dirty_user = False
+            
+            error = None
+            
+            if device is not None:
+                try:
+                    self._write_device_config(device)
+                except Exception as e:
+                    error = e
+                    with self._flush_lock:
+                        self._dirty_device = True
+            
+            if user is not None:
+                try:
+                    self._write_user_preferences(user)
+                except Exception as e:
+                    error = error or e
+                    with self._flush_lock:
+                        self._dirty_user = True
+            
+            if error is not None:
+                raise error
+    
+    def _discard_pending_saves(self):
+        """Cancel any scheduled save without writing."""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._dirty_device = False
+            self._dirty_user = False
+    
+    def _write_device_config(self, data: Dict[str, Any]):
+        """Save a device configuration snapshot to file."""
+        try:
+            with open(self.device_config_path, 'wb') as f:
+                f.write(_json_dumps(data))
         except Exception as e:
             logger.error(f"Failed to save device config: {e}")
             raise
     
-    def _save_user_preferences(self):
-        """Save user preferences to file."""
+    def _write_user_preferences(self, data: Dict[str, Any]):
+        """Save a user preferences snapshot to file."""
         try:
-            with open(self.user_prefs_path, 'w') as f:
-                yaml.dump(self.user_preferences.model_dump(), f, default_flow_style=False, indent=2)
+            with open(self.user_prefs_path, 'wb') as f:
+                f.write(_json_dumps(data))
         except Exception as e:
             logger.error(f"Failed to save user preferences: {e}")
             raise
     
     def get_setting(self, category: str, key: str, default=None):
         """Get a specific setting value."""
+        model = self._categories.get(category)
+        if model is None:
+            logger.warning(f"Unknown settings category: {category}")
+            return default
+        
         try:
-            if category == "display":
-                return getattr(self.display_config, key, default)
-            elif category == "device":
-                return getattr(self.device_config, key, default)
-            elif category == "user":
-                return getattr(self.user_preferences, key, default)
-            else:
-                logger.warning(f"Unknown settings category: {category}")
-                return default
+            return getattr(model, key, default)
         except AttributeError:
             logger.warning(f"Setting not found: {category}.{key}")
             return default
     
     def set_setting(self, category: str, key: str, value):
-        """Set a specific setting value."""
+        """Set a specific setting value. The write to disk is debounced like update_*()."""
         try:
-            if category == "display":
-                setattr(self.display_config, key, value)
-                self._save_device_config()
-            elif category == "device":
-                setattr(self.device_config, key, value)
-                self._save_device_config()
-            elif category == "user":
-                setattr(self.user_preferences, key, value)
-                self._save_user_preferences()
-            else:
+            model = self._categories.get(category)
+            if model is None:
                 raise ValueError(f"Unknown settings category: {category}")
+            
+            type(model).__pydantic_validator__.validate_assignment(model, key, value)
+            self._dump_cache.pop(category, None)
+            self._savers[category]()
                 
             logger.info(f"Setting updated: {category}.{key} = {value}")
             
@@ -272,11 +499,17 @@ class SettingsManager:
         self.display_config = DisplayConfig()
         self.device_config = DeviceConfig()
         self.user_preferences = UserPreferences()
+        self._dump_cache.clear()
+        self._bind_categories()
         
-        self._create_default_configs()
+        # Defaults are written below, so pending saves are obsolete; hold the write
+        # lock so an in-flight flush cannot overwrite the fresh files
+        with self._write_lock:
+            self._discard_pending_saves()
+            self._create_default_configs()
     
     def get_config_summary(self) -> Dict[str, Any]:
-        """Get a summary of all current configuration."""
+        """Get a summary of all current configuration as plain, JSON-serializable dicts."""
         return {
             "display": self.display_config.model_dump(),
             "device": self.device_config.model_dump(),
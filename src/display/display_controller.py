@@ -4,30 +4,52 @@ Handles communication with the 128x64px transparent OLED display.
 """
 
 import asyncio
+import functools
 import logging
-from datetime import datetime
-from typing import Optional, Tuple
+import time
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Tuple, Union
 from pathlib import Path
 
-try:
-    from luma.core.interface.serial import i2c, spi
-    from luma.core.render import canvas
-    from luma.oled.device import ssd1306
-    from PIL import Image, ImageDraw, ImageFont
-    import RPi.GPIO as GPIO
-except ImportError as e:
-    # For development on non-Pi systems
-    logging.warning(f"Hardware libraries not available: {e}")
-    ssd1306 = None
-    GPIO = None
+if TYPE_CHECKING:
+    # Imported for annotations only; pulling in pydantic here would slow every import
+    from config.settings_manager import DisplayConfig
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of (font, text) widths kept in the metrics cache
+TEXT_METRICS_CACHE_SIZE = 256
+
+# Progress bar geometry: x, y, width, height
+PROGRESS_BAR_BOX = (10, 30, 108, 10)
+
+# SSD1306 addressing commands
+SSD1306_COLUMNADDR = 0x21
+SSD1306_PAGEADDR = 0x22
+SSD1306_SETCONTRAST = 0x81
+
+
+@functools.lru_cache(maxsize=16)
+def _load_truetype(path: str, size: int):
+    """Load a TrueType font, reusing it across DisplayController instances."""
+    from PIL import ImageFont
+    return ImageFont.truetype(path, size)
+
+
+def _clamp_brightness(brightness: int) -> int:
+    """Clamp a brightness value to the controller's 0-255 contrast range."""
+    return 0 if brightness < 0 else 255 if brightness > 255 else brightness
+
 
 class DisplayController:
     """Controls the OLED display with async support and multiple display modes."""
     
-    def __init__(self, config: dict):
+    def __init__(self, config: Union["DisplayConfig", Mapping[str, Any]]):
+        # Validate plain mappings once up front; everything below reads typed attributes
+        if isinstance(config, Mapping):
+            from config.settings_manager import DisplayConfig
+            
+            # Plain mappings have always defaulted to I2C, unlike the settings file default
+            config = DisplayConfig(**{'interface': 'i2c', **config})
         self.config = config
         self.device = None
         self.width = 128
@@ -35,31 +57,65 @@ class DisplayController:
         self.font_small = None
         self.font_medium = None
         self.font_large = None
+        self._font_map: Dict[str, object] = {}
         self.current_task = None
         
+        # Persistent framebuffer reused for every frame
+        self._framebuffer = None
+        self._draw = None
+        
+        # Last page bytes sent to the controller, used to send only dirty pages
+        self._prev_pages: Optional[list] = None
+        self._page_transpose = None
+        
+        # (font id, text) -> advance width, FIFO-evicted; font id -> line height
+        self._text_metrics_cache: Dict[Tuple[int, str], int] = {}
+        self._line_heights: Dict[int, int] = {}
+        
+        # Pre-rendered progress bar chrome (label + empty outline)
+        self._progress_base = None
+        self._progress_label: Optional[str] = None
+        
+        # Clock text cache, rebuilt only when the minute rolls over
+        self._last_minute_bucket: Optional[int] = None
+        self._last_format: Optional[bool] = None
+        self._last_time_text: Optional[str] = None
+        
         # Display state
-        self.brightness = config.get('brightness', 255)
-        self.rotation = config.get('rotation', 0)
-        self.interface_type = config.get('interface', 'i2c')  # 'i2c' or 'spi'
+        self.brightness = config.brightness
+        self.rotation = config.rotation
+        self.interface_type = config.interface  # 'i2c' or 'spi'
         
     async def initialize(self):
         """Initialize the OLED display and load fonts."""
         logger.info("Initializing OLED display...")
         
+        # Hardware libraries are imported lazily so that importing this module stays cheap
+        try:
+            from luma.core.interface.serial import i2c, spi
+            from luma.oled.device import ssd1306
+        except ImportError as e:
+            # For development on non-Pi systems
+            logger.warning(f"Hardware libraries not available: {e}")
+            logger.warning("Running in development mode - display simulation enabled")
+            await self._setup_simulation_mode()
+            return
+        
         try:
             # Initialize interface based on configuration
+            cfg = self.config
             if self.interface_type == 'i2c':
-                i2c_port = self.config.get('i2c_port', 1)
-                i2c_address = int(self.config.get('i2c_address', '0x3C'), 16)
+                i2c_port = cfg.i2c_port
+                i2c_address = cfg.i2c_address_int
                 serial = i2c(port=i2c_port, address=i2c_address)
                 logger.info(f"I2C interface: port={i2c_port}, address=0x{i2c_address:02X}")
                 
             elif self.interface_type == 'spi':
-                spi_device = self.config.get('spi_device', 0)
-                spi_port = self.config.get('spi_port', 0)
-                dc_pin = self.config.get('spi_dc_pin', 24)
-                rst_pin = self.config.get('spi_rst_pin', 25)
-                cs_pin = self.config.get('spi_cs_pin', 8)
+                spi_device = cfg.spi_device
+                spi_port = cfg.spi_port
+                dc_pin = cfg.spi_dc_pin
+                rst_pin = cfg.spi_rst_pin
+                cs_pin = cfg.spi_cs_pin
                 
                 serial = spi(device=spi_device, port=spi_port, 
                            gpio_DC=dc_pin, gpio_RST=rst_pin, gpio_CS=cs_pin)
@@ -69,7 +125,8 @@ class DisplayController:
                 raise ValueError(f"Unsupported interface: {self.interface_type}")
             
             # Initialize the OLED device
-            self.device = ssd1306(serial, width=self.width, height=self.height, rotate=self.rotation)
+            self._attach_device(ssd1306(serial, width=self.width, height=self.height,
+                                        rotate=self.rotation))
             
             # Set brightness
             self.device.contrast(self.brightness)
@@ -83,12 +140,23 @@ class DisplayController:
             logger.info(f"Display initialized: {self.width}x{self.height}, interface: {self.interface_type}")
             
         except Exception as e:
-            if ssd1306 is None:
-                logger.warning("Running in development mode - display simulation enabled")
-                await self._setup_simulation_mode()
-            else:
-                logger.error(f"Failed to initialize display: {e}")
-                raise
+            logger.error(f"Failed to initialize display: {e}")
+            raise
+    
+    def _attach_device(self, device):
+        """Use a luma device and allocate the framebuffer that frames are drawn into."""
+        from PIL import Image, ImageDraw
+        
+        self.device = device
+        
+        # Allocate the framebuffer once; frames are redrawn into it in place
+        self._framebuffer = Image.new(device.mode, device.size)
+        self._draw = ImageDraw.Draw(self._framebuffer)
+        self._prev_pages = None
+        
+        # Rotating the 1-bit image by 270 degrees packs each column into
+        # SSD1306 page bytes (LSB = top pixel), interleaved by page
+        self._page_transpose = Image.Transpose.ROTATE_270
     
     async def _setup_simulation_mode(self):
         """Setup simulation mode for development without hardware."""
@@ -99,21 +167,27 @@ class DisplayController:
         class MockFont:
             def getbbox(self, text):
                 return (0, 0, len(text) * 6, 10)
+            
+            def getlength(self, text):
+                return len(text) * 6
         
         self.font_small = MockFont()
         self.font_medium = MockFont()
         self.font_large = MockFont()
+        self._build_font_map()
     
     async def _load_fonts(self):
         """Load fonts for different text sizes."""
+        from PIL import ImageFont
+        
         try:
             # Try to load system fonts, fall back to PIL defaults
             fonts_dir = Path("/usr/share/fonts/truetype/dejavu")
             if fonts_dir.exists():
                 font_path = fonts_dir / "DejaVuSans.ttf"
-                self.font_small = ImageFont.truetype(str(font_path), 10)
-                self.font_medium = ImageFont.truetype(str(font_path), 12)
-                self.font_large = ImageFont.truetype(str(font_path), 16)
+                self.font_small = _load_truetype(str(font_path), 10)
+                self.font_medium = _load_truetype(str(font_path), 12)
+                self.font_large = _load_truetype(str(font_path), 16)
             else:
                 # Use PIL default fonts
                 self.font_small = ImageFont.load_default()
@@ -129,12 +203,61 @@ class DisplayController:
             self.font_small = default_font
             self.font_medium = default_font
             self.font_large = default_font
+        
+        self._build_font_map()
+    
+    def _build_font_map(self):
+        """Map font size names to the loaded fonts."""
+        self._font_map = {
+            "small": self.font_small,
+            "medium": self.font_medium,
+            "large": self.font_large
+        }
+    
+    def _begin_frame(self):
+        """Blank the framebuffer and return its draw context."""
+        self._draw.rectangle(self.device.bounding_box, outline=0, fill=0)
+        return self._draw
+    
+    def _end_frame(self):
+        """Push the framebuffer to the display, writing only pages that changed."""
+        device = self.device
+        image = device.preprocess(self._framebuffer)
+        packed = image.transpose(self._page_transpose).tobytes()
+        
+        # Geometry comes from the preprocessed image, which is in the panel's
+        # native orientation; device.width/height are the rotated sizes
+        num_pages = image.height // 8
+        col_start = getattr(device, "_colstart", 0)
+        col_end = col_start + image.width - 1
+        
+        # packed holds one byte per page for each column, bottom page first
+        pages = [packed[num_pages - 1 - p::num_pages] for p in range(num_pages)]
+        
+        prev = self._prev_pages
+        page = 0
+        while page < num_pages:
+            if prev is not None and pages[page] == prev[page]:
+                page += 1
+                continue
+            
+            # Send each run of consecutive dirty pages as one burst
+            end = page
+            while end + 1 < num_pages and (prev is None or pages[end + 1] != prev[end + 1]):
+                end += 1
+            
+            device.command(SSD1306_COLUMNADDR, col_start, col_end,
+                           SSD1306_PAGEADDR, page, end)
+            device.data(list(b"".join(pages[page:end + 1])))
+            page = end + 1
+        
+        self._prev_pages = pages
     
     async def clear(self):
         """Clear the display."""
         if self.device:
-            with canvas(self.device) as draw:
-                draw.rectangle(self.device.bounding_box, outline=0, fill=0)
+            self._begin_frame()
+            self._end_frame()
         else:
             logger.info("[SIM] Display cleared")
     
@@ -173,53 +296,76 @@ class DisplayController:
                           position: Tuple[int, int], center: bool):
         """Render text to the display."""
         # Select font
-        font_map = {
-            "small": self.font_small,
-            "medium": self.font_medium,
-            "large": self.font_large
-        }
-        font = font_map.get(font_size, self.font_medium)
+        font = self._font_map.get(font_size, self.font_medium)
         
         if self.device:
-            with canvas(self.device) as draw:
-                self._draw_text(draw, text, font, position, center)
+            draw = self._begin_frame()
+            self._draw_text(draw, text, font, position, center)
+            self._end_frame()
         else:
             # Simulation mode
             logger.info(f"[SIM] Display text ({font_size}): {repr(text)}")
     
+    def _measure(self, font, text: str) -> int:
+        """Return the cached advance width of text in the given font."""
+        key = (id(font), text)
+        width = self._text_metrics_cache.get(key)
+        if width is None:
+            width = int(font.getlength(text))
+            
+            if len(self._text_metrics_cache) >= TEXT_METRICS_CACHE_SIZE:
+                # Evict the oldest entry
+                del self._text_metrics_cache[next(iter(self._text_metrics_cache))]
+            self._text_metrics_cache[key] = width
+        return width
+    
+    def _line_height(self, font) -> int:
+        """Return the cached line height for a font."""
+        height = self._line_heights.get(id(font))
+        if height is None:
+            bbox = font.getbbox("Ay")
+            height = bbox[3] - bbox[1] + 2
+            self._line_heights[id(font)] = height
+        return height
+    
     def _draw_text(self, draw, text: str, font, position: Tuple[int, int], center: bool):
         """Helper to draw text with proper positioning."""
         lines = text.split('\n')
+        line_height = self._line_height(font)
         
         if center and position is None:
             # Calculate center position for multi-line text
-            total_height = len(lines) * 15  # Approximate line height
+            total_height = len(lines) * line_height
             start_y = (self.height - total_height) // 2
             
             for i, line in enumerate(lines):
-                bbox = draw.textbbox((0, 0), line, font=font)
-                text_width = bbox[2] - bbox[0]
-                x = (self.width - text_width) // 2
-                y = start_y + (i * 15)
+                x = (self.width - self._measure(font, line)) // 2
+                y = start_y + (i * line_height)
                 draw.text((x, y), line, font=font, fill=255)
         else:
             # Use specified position or top-left
             x, y = position if position else (0, 0)
             for i, line in enumerate(lines):
-                draw.text((x, y + i * 15), line, font=font, fill=255)
+                draw.text((x, y + i * line_height), line, font=font, fill=255)
     
     async def show_time(self, format_12h: bool = True, duration: float = None):
         """Display current time."""
-        now = datetime.now()
-        if format_12h:
-            time_str = now.strftime("%I:%M %p")
-        else:
-            time_str = now.strftime("%H:%M")
+        ts = time.time()
+        minute_bucket = int(ts // 60)
         
-        date_str = now.strftime("%m/%d/%Y")
-        display_text = f"{time_str}\n{date_str}"
+        if minute_bucket != self._last_minute_bucket or format_12h != self._last_format:
+            lt = time.localtime(ts)
+            if format_12h:
+                time_str = f"{lt.tm_hour % 12 or 12:02d}:{lt.tm_min:02d} {'AM' if lt.tm_hour < 12 else 'PM'}"
+            else:
+                time_str = f"{lt.tm_hour:02d}:{lt.tm_min:02d}"
+            
+            date_str = f"{lt.tm_mon:02d}/{lt.tm_mday:02d}/{lt.tm_year}"
+            self._last_time_text = f"{time_str}\n{date_str}"
+            self._last_minute_bucket = minute_bucket
+            self._last_format = format_12h
         
-        await self.show_text(display_text, font_size="medium", duration=duration)
+        await self.show_text(self._last_time_text, font_size="medium", duration=duration)
     
     async def show_status(self, status: str, details: str = None, duration: float = 3):
         """Show system status information."""
@@ -237,11 +383,47 @@ class DisplayController:
     
     async def set_brightness(self, brightness: int):
         """Set display brightness (0-255)."""
-        self.brightness = max(0, min(255, brightness))
+        # Inline clamp: this runs on the auto-dim path, so avoid a helper call
+        brightness = 0 if brightness < 0 else 255 if brightness > 255 else brightness
+        
+        # Skip the I2C/SPI contrast command when nothing changes
+        if brightness == self.brightness:
+            return
+        
+        self.brightness = brightness
         if self.device:
             self.device.contrast(self.brightness)
         logger.info(f"Display brightness set to {self.brightness}")
     
+    async def fade_to_brightness(self, target: int, duration: float, steps: int = 16):
+        """
+        Fade display brightness to a target level.
+        
+        Args:
+            target: Final brightness (0-255)
+            duration: Total fade time in seconds
+            steps: Number of intermediate contrast levels
+        """
+        if steps < 1:
+            raise ValueError(f"Fade needs at least one step, got {steps}")
+        
+        target = _clamp_brightness(target)
+        start = self.brightness
+        if target == start:
+            return
+        
+        # Precompute the ramp so each step is a single contrast command
+        ramp = [round(start + (target - start) * i / steps) for i in range(1, steps + 1)]
+        interval = duration / steps
+        
+        for level in ramp:
+            await asyncio.sleep(interval)
+            if self.device:
+                self.device.command(SSD1306_SETCONTRAST, level)
+            self.brightness = level
+        
+        logger.info(f"Display brightness faded to {self.brightness}")
+    
     async def show_progress_bar(self, progress: float, label: str = "Progress", duration: float = None):
         """
         Show a progress bar.
@@ -252,28 +434,27 @@ class DisplayController:
             duration: How long to show (None for permanent)
         """
         if self.device:
-            with canvas(self.device) as draw:
-                # Draw label
-                draw.text((10, 10), label, font=self.font_small, fill=255)
-                
-                # Draw progress bar outline
-                bar_x, bar_y = 10, 30
-                bar_width, bar_height = 108, 10
-                draw.rectangle([bar_x, bar_y, bar_x + bar_width, bar_y + bar_height], 
-                             outline=255, fill=0)
-                
-                # Draw progress fill
-                fill_width = int(bar_width * progress)
-                if fill_width > 0:
-                    draw.rectangle([bar_x, bar_y, bar_x + fill_width, bar_y + bar_height], 
-                                 outline=255, fill=255)
-                
-                # Draw percentage
-                pct_text = f"{int(progress * 100)}%"
-                bbox = draw.textbbox((0, 0), pct_text, font=self.font_small)
-                text_width = bbox[2] - bbox[0]
-                text_x = (self.width - text_width) // 2
-                draw.text((text_x, 45), pct_text, font=self.font_small, fill=255)
+            # Redraw the static chrome only when the label changes
+            if label != self._progress_label:
+                self._build_progress_base(label)
+            
+            self._framebuffer.paste(self._progress_base)
+            draw = self._draw
+            
+            # Draw progress fill
+            bar_x, bar_y, bar_width, bar_height = PROGRESS_BAR_BOX
+            fill_width = int(bar_width * progress)
+            if fill_width > 0:
+                draw.rectangle([bar_x, bar_y, bar_x + fill_width, bar_y + bar_height], 
+                             outline=255, fill=255)
+            
+            # Draw percentage
+            pct_text = f"{int(progress * 100)}%"
+            text_width = self._measure(self.font_small, pct_text)
+            text_x = (self.width - text_width) // 2
+            draw.text((text_x, 45), pct_text, font=self.font_small, fill=255)
+            
+            self._end_frame()
         else:
             logger.info(f"[SIM] Progress bar: {label} - {int(progress * 100)}%")
         
@@ -281,6 +462,23 @@ class DisplayController:
             await asyncio.sleep(duration)
             await self.clear()
     
+    def _build_progress_base(self, label: str):
+        """Render the progress bar label and empty outline into a reusable image."""
+        from PIL import Image, ImageDraw
+        
+        self._progress_base = Image.new(self.device.mode, self.device.size)
+        draw = ImageDraw.Draw(self._progress_base)
+        
+        # Draw label
+        draw.text((10, 10), label, font=self.font_small, fill=255)
+        
+        # Draw progress bar outline
+        bar_x, bar_y, bar_width, bar_height = PROGRESS_BAR_BOX
+        draw.rectangle([bar_x, bar_y, bar_x + bar_width, bar_y + bar_height], 
+                     outline=255, fill=0)
+        
+        self._progress_label = label
+    
     async def shutdown(self):
         """Clean shutdown of the display."""
         logger.info("Shutting down display...")
@@ -291,8 +489,12 @@ class DisplayController:
         
         await self.clear()
         
-        # Cleanup GPIO if available
-        if GPIO:
-            GPIO.cleanup()
+        # Cleanup GPIO if hardware was in use
+        if self.device is not None:
+            try:
+                import RPi.GPIO as GPIO
+                GPIO.cleanup()
+            except ImportError:
+                pass
         
         logger.info("Display shutdown complete") 
\ No newline at end of file
@@ -4,14 +4,24 @@ Provides a consistent interface for all input modules.
 """
 
 import asyncio
+import heapq
 import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterable, Optional, List, Sequence, Tuple, Union
 from datetime import datetime, timedelta
+from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
 
+class InputConfig(BaseModel):
+    """Common input module settings."""
+    enabled: bool = Field(default=True, description="Whether the module collects data")
+    update_interval: float = Field(default=60, description="Seconds between updates")
+    max_errors: int = Field(default=5, description="Consecutive errors before the module stops")
+
+
 class InputData:
     """Container for data from input sources."""
     
@@ -24,7 +34,11 @@ class InputData:
         self.timestamp = timestamp or datetime.now()
         self.priority = priority  # 1-10, lower = higher priority
         self.expires_at = expires_at
-        self.id = f"{source}_{data_type}_{int(self.timestamp.timestamp())}"
+    
+    @property
+    def id(self) -> str:
+        """Identifier built on demand; most consumers never read it."""
+        return f"{self.source}_{self.data_type}_{int(self.timestamp.timestamp())}"
     
     def is_expired(self) -> bool:
         """Check if this data has expired."""
@@ -48,28 +62,53 @@ class InputData:
 class BaseInput(ABC):
     """Abstract base class for all input modules."""
     
-    def __init__(self, name: str, config: Dict[str, Any]):
+    # Settings model used to validate dict configs; subclasses may extend it
+    config_class = InputConfig
+    
+    def __init__(self, name: str, config: Union[InputConfig, Dict[str, Any]]):
+        # Parse the config once; later reads are plain attribute access
+        if not isinstance(config, self.config_class):
+            if isinstance(config, BaseModel):
+                config = config.model_dump(exclude_unset=True)
+            config = self.config_class(**config)
+        
         self.name = name
         self.config = config
-        self.enabled = config.get('enabled', True)
-        self.update_interval = config.get('update_interval', 60)  # seconds
+        self.enabled = config.enabled
+        self.update_interval = config.update_interval  # seconds
         self.running = False
-        self.last_update = None
+        self.last_update = None  # Wall-clock time of the last update, for status only
+        self._next_update_mono = 0.0  # time.monotonic() deadline for the next update
+        self._stop_event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None  # Update loop task, held so it can be cancelled
         self.error_count = 0
-        self.max_errors = config.get('max_errors', 5)
+        self.max_errors = config.max_errors
         
-        # Data cache
+        # Data cache, keyed by (source, data_type) so each key holds only the newest item
+        self._data_by_key: Dict[Tuple[str, str], InputData] = {}
+        
+        # List view of the same items, kept in sync in place; treat as read-only
         self.current_data: List[InputData] = []
+        
+        # Min-heap of (expires_at, key); entries superseded by newer data are skipped lazily
+        self._expiry_heap: List[Tuple[datetime, Tuple[str, str]]] = []
         self.data_listeners = []
+        
+        # Listeners split by kind at registration time
+        self._sync_listeners = []
+        self._async_listeners = []
+        
+        # Pending fan-out tasks, held until done so they are not garbage collected
+        self._fanout_tasks = set()
     
     async def initialize(self):
         """Initialize the input module."""
-        logger.info(f"Initializing input module: {self.name}")
+        logger.info("Initializing input module: %s", self.name)
         try:
             await self._initialize()
-            logger.info(f"Input module {self.name} initialized successfully")
+            logger.info("Input module %s initialized successfully", self.name)
         except Exception as e:
-            logger.error(f"Failed to initialize {self.name}: {e}")
+            logger.error("Failed to initialize %s: %s", self.name, e)
             raise
     
     @abstractmethod
@@ -80,56 +119,92 @@ class BaseInput(ABC):
     async def start(self):
         """Start the input module data collection."""
         if not self.enabled:
-            logger.info(f"Input module {self.name} is disabled")
+            logger.info("Input module %s is disabled", self.name)
             return
         
-        logger.info(f"Starting input module: {self.name}")
+        logger.info("Starting input module: %s", self.name)
         self.running = True
+        self._stop_event.clear()
         
-        # Start the update loop
-        asyncio.create_task(self._update_loop())
+        # Start the update loop, keeping a reference so it is not garbage collected
+        self._task = asyncio.create_task(self._update_loop(), name=f"{self.name}_loop")
+        self._task.add_done_callback(self._on_loop_done)
     
     async def stop(self):
         """Stop the input module."""
-        logger.info(f"Stopping input module: {self.name}")
+        logger.info("Stopping input module: %s", self.name)
         self.running = False
+        self._stop_event.set()
+        
+        # Cancel the update loop and wait for it to exit
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        
         await self._cleanup()
     
+    def _on_loop_done(self, task: asyncio.Task):
+        """Log an update loop that died from an exception and mark the module stopped."""
+        if task.cancelled():
+            return
+        
+        error = task.exception()
+        if error is not None:
+            logger.error("Update loop for %s crashed: %s", self.name, error, exc_info=error)
+            self.running = False
+    
     async def _update_loop(self):
         """Main update loop for the input module."""
         while self.running:
-            try:
-                # Check if it's time for an update
-                if self._should_update():
+            now = datetime.now()
+            
+            # Check if it's time for an update
+            if self._should_update():
+                try:
                     await self._fetch_data()
-                    self.last_update = datetime.now()
-                    self.error_count = 0  # Reset error count on successful update
-                
-                # Clean expired data
-                self._clean_expired_data()
-                
-                # Wait before next update
-                await asyncio.sleep(min(self.update_interval, 10))
+                except Exception as e:
+                    self.error_count += 1
+                    logger.error("Error in %s update loop: %s", self.name, e)
+                    
+                    if self.error_count >= self.max_errors:
+                        logger.error("Max errors reached for %s, stopping", self.name)
+                        self.running = False
+                        break
+                    
+                    # Wait longer after errors
+                    await self._sleep(30)
+                    continue
                 
-            except Exception as e:
-                self.error_count += 1
-                logger.error(f"Error in {self.name} update loop: {e}")
-                
-                if self.error_count >= self.max_errors:
-                    logger.error(f"Max errors reached for {self.name}, stopping")
-                    self.running = False
-                    break
-                
-                # Wait longer after errors
-                await asyncio.sleep(30)
+                self.last_update = now
+                self._next_update_mono = time.monotonic() + self.update_interval
+                self.error_count = 0  # Reset error count on successful update
+            
+            # Clean expired data
+            self._clean_expired_data(now)
+            
+            # Sleep until the next update or the next expiry, whichever is sooner
+            sleep_for = self._next_update_mono - time.monotonic()
+            if self._expiry_heap:
+                until_expiry = (self._expiry_heap[0][0] - datetime.now()).total_seconds()
+                if until_expiry < sleep_for:
+                    sleep_for = until_expiry
+            
+            await self._sleep(sleep_for)
+    
+    async def _sleep(self, seconds: float):
+        """Sleep for up to the given time, waking early if stop() is called."""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=max(0.0, seconds))
+        except asyncio.TimeoutError:
+            pass
     
     def _should_update(self) -> bool:
         """Check if it's time for an update."""
-        if self.last_update is None:
-            return True
-        
-        time_since_update = datetime.now() - self.last_update
-        return time_since_update.total_seconds() >= self.update_interval
+        return time.monotonic() >= self._next_update_mono
     
     @abstractmethod
     async def _fetch_data(self):
@@ -140,50 +215,113 @@ class BaseInput(ABC):
         """Clean up resources. Override in subclasses if needed."""
         pass
     
-    def _clean_expired_data(self):
+    def _clean_expired_data(self, now: Optional[datetime] = None):
         """Remove expired data from cache."""
-        self.current_data = [data for data in self.current_data if not data.is_expired()]
+        if now is None:
+            now = datetime.now()
+        
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            data = self._data_by_key.get(key)
+            # Skip stale entries whose key has since been replaced with newer data
+            if data is not None and data.expires_at == expires_at:
+                del self._data_by_key[key]
+                self.current_data.remove(data)
     
     def add_data(self, data: InputData):
         """Add new data to the module."""
-        # Remove old data of the same type from the same source
-        self.current_data = [d for d in self.current_data 
-                           if not (d.source == data.source and d.data_type == data.data_type)]
-        
-        # Add new data
-        self.current_data.append(data)
+        self._store(data)
         
         # Notify listeners
-        self._notify_listeners(data)
+        self._notify_listeners((data,))
+    
+    def add_data_batch(self, items: Sequence[InputData]):
+        """Add several data items at once, notifying listeners in a single dispatch."""
+        for data in items:
+            self._store(data)
+        
+        self._notify_listeners(items)
     
-    def get_current_data(self, data_type: Optional[str] = None) -> List[InputData]:
-        """Get current data, optionally filtered by type."""
-        if data_type:
-            return [data for data in self.current_data if data.data_type == data_type]
-        return self.current_data.copy()
+    def _store(self, data: InputData):
+        """Cache a data item, replacing old data of the same type from the same source."""
+        key = (data.source, data.data_type)
+        old = self._data_by_key.get(key)
+        if old is None:
+            self.current_data.append(data)
+        elif old is not data:
+            # At most one item shares the key, so swap it in place without rebuilding the list
+            self.current_data[self.current_data.index(old)] = data
+        self._data_by_key[key] = data
+        if data.expires_at is not None:
+            heapq.heappush(self._expiry_heap, (data.expires_at, key))
+    
+    def get_current_data(self, data_type: Optional[str] = None,
+                         copy: bool = False) -> Iterable[InputData]:
+        """
+        Get current data, optionally filtered by type.
+        
+        Returns a live read-only view (or a lazy iterator when filtered);
+        pass copy=True to get an independent list instead.
+        """
+        if data_type is None:
+            values = self._data_by_key.values()
+        else:
+            values = (data for data in self._data_by_key.values() if data.data_type == data_type)
+        return list(values) if copy else values
     
     def get_latest_data(self, data_type: str) -> Optional[InputData]:
         """Get the most recent data of a specific type."""
-        filtered_data = self.get_current_data(data_type)
-        if not filtered_data:
-            return None
-        
-        return max(filtered_data, key=lambda x: x.timestamp)
+        return max((data for data in self._data_by_key.values() if data.data_type == data_type),
+                   key=lambda x: x.timestamp, default=None)
     
     def add_data_listener(self, callback):
         """Add a callback function to be notified of new data."""
         self.data_listeners.append(callback)
+        
+        # Classify once here so dispatch never has to inspect the callback
+        if (asyncio.iscoroutinefunction(callback)
+                or asyncio.iscoroutinefunction(getattr(callback, '__call__', None))):
+            self._async_listeners.append(callback)
+        else:
+            self._sync_listeners.append(callback)
     
-    def _notify_listeners(self, data: InputData):
+    def _notify_listeners(self, items: Sequence[InputData]):
         """Notify all listeners of new data."""
-        for callback in self.data_listeners:
-            try:
-                if asyncio.iscoroutinefunction(callback):
-                    asyncio.create_task(callback(data))
-                else:
+        for callback in self._sync_listeners:
+            for data in items:
+                try:
                     callback(data)
-            except Exception as e:
-                logger.error(f"Error notifying listener in {self.name}: {e}")
+                except Exception as e:
+                    logger.error("Error notifying listener in %s: %s", self.name, e)
+        
+        # One task per dispatch fans out to every async listener
+        if self._async_listeners:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError as e:
+                logger.error("Error notifying listener in %s: %s", self.name, e)
+                return
+            
+            task = loop.create_task(self._fanout(items))
+            self._fanout_tasks.add(task)
+            task.add_done_callback(self._fanout_tasks.discard)
+    
+    async def _fanout(self, items: Sequence[InputData]):
+        """Run all async listeners concurrently for a batch of data items."""
+        coros = []
+        for callback in self._async_listeners:
+            for data in items:
+                # A listener that fails when called must not keep the others from running
+                try:
+                    coros.append(callback(data))
+                except Exception as e:
+                    logger.error("Error notifying listener in %s: %s", self.name, e)
+        
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Error notifying listener in %s: %s", self.name, result)
     
     def get_status(self) -> Dict[str, Any]:
         """Get module status information."""
@@ -193,6 +331,6 @@ class BaseInput(ABC):
             'running': self.running,
             'last_update': self.last_update.isoformat() if self.last_update else None,
             'error_count': self.error_count,
-            'data_count': len(self.current_data),
+            'data_count': len(self._data_by_key),
             'update_interval': self.update_interval
         } 
\ No newline at end of file
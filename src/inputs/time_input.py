@@ -6,33 +6,46 @@ A simple input module that provides current time and date information.
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Union
 
-from .base_input import BaseInput, InputData
+from pydantic import Field
+
+from .base_input import BaseInput, InputConfig, InputData
 
 logger = logging.getLogger(__name__)
 
 
+class TimeConfig(InputConfig):
+    """Time input module settings."""
+    update_interval: float = Field(default=30, description="Seconds between updates")
+    format_12h: bool = Field(default=True, description="Use 12-hour format")
+    include_seconds: bool = Field(default=False, description="Include seconds in the time")
+    include_date: bool = Field(default=True, description="Also publish date data")
+    timezone: str = Field(default="local", description="Timezone name ('local' for system time)")  # Could be extended to support other timezones
+
+
 class TimeInput(BaseInput):
     """Input module that provides current time and date information."""
     
-    def __init__(self, config: Dict[str, Any]):
-        # Set default configuration
-        default_config = {
-            'enabled': True,
-            'update_interval': 30,  # Update every 30 seconds
-            'format_12h': True,     # Use 12-hour format
-            'include_seconds': False,
-            'include_date': True,
-            'timezone': 'local'     # Could be extended to support other timezones
-        }
-        default_config.update(config)
+    config_class = TimeConfig
+    
+    def __init__(self, config: Union[TimeConfig, Dict[str, Any]]):
+        super().__init__("time_input", config)
+        
+        self.format_12h = self.config.format_12h
+        self.include_seconds = self.config.include_seconds
+        self.include_date = self.config.include_date
         
-        super().__init__("time_input", default_config)
+        # Resolve the strftime pattern once; the format cannot change after init
+        if self.format_12h:
+            self._time_fmt = "%I:%M:%S %p" if self.include_seconds else "%I:%M %p"
+        else:
+            self._time_fmt = "%H:%M:%S" if self.include_seconds else "%H:%M"
         
-        self.format_12h = self.config.get('format_12h', True)
-        self.include_seconds = self.config.get('include_seconds', False)
-        self.include_date = self.config.get('include_date', True)
+        # Reusable data slots, updated in place on every fetch
+        self._time_slot = InputData(self.name, "time", {}, priority=3)  # Medium priority
+        self._date_slot = InputData(self.name, "date", {}, priority=4)  # Lower priority than time
+        self._display_slot = InputData(self.name, "display_time", {}, priority=2)  # High priority for display
     
     async def _initialize(self):
         """Initialize the time input module."""
@@ -42,57 +55,40 @@ class TimeInput(BaseInput):
     async def _fetch_data(self):
         """Fetch current time and date information."""
         now = datetime.now()
+        iso = now.isoformat()
         
         # Generate time string
-        if self.format_12h:
-            if self.include_seconds:
-                time_str = now.strftime("%I:%M:%S %p")
-            else:
-                time_str = now.strftime("%I:%M %p")
-        else:
-            if self.include_seconds:
-                time_str = now.strftime("%H:%M:%S")
-            else:
-                time_str = now.strftime("%H:%M")
+        time_str = now.strftime(self._time_fmt)
         
         # Add time data
-        time_data = InputData(
-            source=self.name,
-            data_type="time",
-            content={
-                "time_str": time_str,
-                "hour": now.hour,
-                "minute": now.minute,
-                "second": now.second,
-                "timestamp": now.isoformat()
-            },
-            priority=3,  # Medium priority
-            expires_at=now + timedelta(minutes=2)  # Expires in 2 minutes
-        )
-        self.add_data(time_data)
+        time_data = self._time_slot
+        time_data.timestamp = now
+        time_data.expires_at = now + timedelta(minutes=2)  # Expires in 2 minutes
+        content = time_data.content
+        content["time_str"] = time_str
+        content["hour"] = now.hour
+        content["minute"] = now.minute
+        content["second"] = now.second
+        content["timestamp"] = iso
+        batch = [time_data]
         
         # Add date data if enabled
         if self.include_date:
-            date_str = now.strftime("%B %d, %Y")  # "January 01, 2024"
-            short_date = now.strftime("%m/%d/%Y")  # "01/01/2024"
-            weekday = now.strftime("%A")  # "Monday"
+            # "January 01, 2024", "01/01/2024", "Monday" in a single strftime call
+            date_str, short_date, weekday = now.strftime("%B %d, %Y|%m/%d/%Y|%A").split("|")
             
-            date_data = InputData(
-                source=self.name,
-                data_type="date",
-                content={
-                    "date_str": date_str,
-                    "short_date": short_date,
-                    "weekday": weekday,
-                    "day": now.day,
-                    "month": now.month,
-                    "year": now.year,
-                    "timestamp": now.isoformat()
-                },
-                priority=4,  # Lower priority than time
-                expires_at=now + timedelta(hours=1)  # Expires in 1 hour
-            )
-            self.add_data(date_data)
+            date_data = self._date_slot
+            date_data.timestamp = now
+            date_data.expires_at = now + timedelta(hours=1)  # Expires in 1 hour
+            content = date_data.content
+            content["date_str"] = date_str
+            content["short_date"] = short_date
+            content["weekday"] = weekday
+            content["day"] = now.day
+            content["month"] = now.month
+            content["year"] = now.year
+            content["timestamp"] = iso
+            batch.append(date_data)
         
         # Add combined time/date display data
         if self.include_date:
@@ -100,20 +96,19 @@ class TimeInput(BaseInput):
         else:
             display_text = time_str
         
-        display_data = InputData(
-            source=self.name,
-            data_type="display_time",
-            content={
-                "display_text": display_text,
-                "time_str": time_str,
-                "date_str": short_date if self.include_date else None
-            },
-            priority=2,  # High priority for display
-            expires_at=now + timedelta(minutes=1)  # Expires quickly for display
-        )
-        self.add_data(display_data)
+        display_data = self._display_slot
+        display_data.timestamp = now
+        display_data.expires_at = now + timedelta(minutes=1)  # Expires quickly for display
+        content = display_data.content
+        content["display_text"] = display_text
+        content["time_str"] = time_str
+        content["date_str"] = short_date if self.include_date else None
+        batch.append(display_data)
+        
+        # Store all items and notify listeners once
+        self.add_data_batch(batch)
         
-        logger.debug(f"Time data updated: {time_str}")
+        logger.debug("Time data updated: %s", time_str)
     
     def get_current_time_string(self) -> str:
         """Get the current time as a formatted string."""
@@ -5,8 +5,10 @@ Entry point for the modular wearable companion device.
 """
 
 import asyncio
+import functools
 import logging
 import sys
+import time
 from pathlib import Path
 
 # Add src directory to path for imports
@@ -38,7 +40,7 @@ class WearableDevice:
         
         try:
             # Initialize display
-            self.display = DisplayController(self.settings.get_display_config())
+            self.display = DisplayController(self.settings.display_config)
             await self.display.initialize()
             logger.info("Display initialized successfully")
             
@@ -54,14 +56,24 @@ class WearableDevice:
         self.running = True
         logger.info("Starting main event loop...")
         
+        # Simple demo: cycle through different display modes as (render, seconds) screens
+        screens = [
+            (functools.partial(self.display.show_text, "Hello World!"), 3),
+            (self.display.show_time, 3),
+            (functools.partial(self.display.show_text, "Ready for\nintegration"), 3),
+        ]
+        
         try:
+            # Switch screens on fixed monotonic deadlines so render time does not cause drift
+            next_switch = time.monotonic()
             while self.running:
-                # Simple demo: cycle through different display modes
-                await self.display.show_text("Hello World!", duration=3)
-                await self.display.show_time(duration=3)
-                await self.display.show_text("Ready for\nintegration", duration=3)
-                
-                await asyncio.sleep(1)
+                for render, duration in screens:
+                    await render()
+                    next_switch += duration
+                    await asyncio.sleep(max(0.0, next_switch - time.monotonic()))
+                    
+                    if not self.running:
+                        break
                 
         except KeyboardInterrupt:
             logger.info("Shutdown requested")
@@ -79,6 +91,9 @@ class WearableDevice:
             await self.display.clear()
             await self.display.shutdown()
         
+        # Write any settings changes still waiting on the save timer
+        self.settings.flush()
+        
         logger.info("Device shutdown complete")
 
 
@@ -5,6 +5,7 @@ Optimized for testing the actual hardware on Raspberry Pi Zero 2W.
 """
 
 import asyncio
+import os
 import sys
 import time
 from pathlib import Path
@@ -146,29 +147,32 @@ def check_system():
     print("🔍 System Check")
     print("=" * 20)
     
-    # Check if running on Raspberry Pi
+    # Check if running on Raspberry Pi (stop reading at the first match)
     try:
         with open('/proc/cpuinfo', 'r') as f:
-            cpuinfo = f.read()
-            if 'Raspberry Pi' in cpuinfo:
+            if any('Raspberry Pi' in line for line in f):
                 print("✅ Running on Raspberry Pi")
             else:
                 print("⚠️  Not detected as Raspberry Pi")
     except:
         print("⚠️  Could not read CPU info")
     
+    # List /dev once for both the SPI and GPIO checks
+    try:
+        with os.scandir('/dev') as entries:
+            dev_names = {entry.name for entry in entries}
+    except OSError:
+        dev_names = set()
+    
     # Check for SPI
-    spi_devices = ['/dev/spidev0.0', '/dev/spidev0.1', '/dev/spidev1.0', '/dev/spidev1.1']
-    spi_found = any(Path(dev).exists() for dev in spi_devices)
-    if spi_found:
-        found_devices = [dev for dev in spi_devices if Path(dev).exists()]
+    found_devices = sorted(f"/dev/{name}" for name in dev_names if name.startswith('spidev'))
+    if found_devices:
         print(f"✅ SPI interface available: {', '.join(found_devices)}")
     else:
         print("❌ SPI not enabled - run 'sudo raspi-config'")
     
     # Check GPIO access
-    gpio_path = Path('/dev/gpiomem')
-    if gpio_path.exists():
+    if 'gpiomem' in dev_names:
         print("✅ GPIO access available")
     else:
         print("❌ GPIO access not available")
@@ -176,8 +180,7 @@ def check_system():
     # Check if SPI is enabled in config
     try:
         with open('/boot/config.txt', 'r') as f:
-            config_content = f.read()
-            if 'dtparam=spi=on' in config_content:
+            if any('dtparam=spi=on' in line for line in f):
                 print("✅ SPI enabled in /boot/config.txt")
             else:
                 print("❌ SPI not enabled in /boot/config.txt")
@@ -187,17 +190,74 @@ def check_system():
     print()
 
 
+class _RecordingSerial:
+    """Serial interface stand-in that records commands and data instead of sending them."""
+    
+    def __init__(self):
+        self.writes = []
+    
+    def command(self, *cmd):
+        self.writes.append(('command', list(cmd)))
+    
+    def data(self, data):
+        self.writes.append(('data', list(data)))
+    
+    def cleanup(self):
+        pass
+
+
+def check_page_layout():
+    """Compare the controller's page writes with luma's own SSD1306 layout for every rotation."""
+    print("🧮 Page Layout Check")
+    print("=" * 20)
+    
+    from luma.oled.device import ssd1306
+    from PIL import Image
+    
+    passed = True
+    for rotation in range(4):
+        display = DisplayController({'rotation': rotation})
+        serial = _RecordingSerial()
+        display._attach_device(ssd1306(serial, width=display.width, height=display.height,
+                                       rotate=rotation))
+        
+        # Asymmetric noise so any mix-up of columns, pages or bit order shows up
+        size = display._framebuffer.size
+        display._framebuffer.paste(Image.frombytes('1', size, os.urandom(size[0] * size[1] // 8)))
+        
+        serial.writes.clear()
+        display._end_frame()
+        ours = serial.writes[:]
+        
+        serial.writes.clear()
+        display.device.display(display._framebuffer)
+        expected = serial.writes[:]
+        
+        if ours == expected:
+            print(f"✅ Rotation {rotation}: pages match luma")
+        else:
+            print(f"❌ Rotation {rotation}: pages differ from luma")
+            passed = False
+    
+    print()
+    return passed
+
+
 if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description='Test OLED display on Raspberry Pi')
     parser.add_argument('--quick', action='store_true', help='Run quick test only')
     parser.add_argument('--check', action='store_true', help='Check system requirements only')
+    parser.add_argument('--pages', action='store_true', help='Check SSD1306 page layout against luma only')
     args = parser.parse_args()
     
     try:
         if args.check:
             check_system()
+        elif args.pages:
+            if not check_page_layout():
+                sys.exit(1)
         elif args.quick:
             asyncio.run(quick_test())
         else: